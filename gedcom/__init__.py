@@ -30,7 +30,167 @@ __all__ = ["Gedcom", "Element", "GedcomParseError"]
 
 # Global imports
 import re as regex
-from sys import version_info
+from sys import intern
+
+# Matches a single GEDCOM line, compiled once at import time.
+_GEDCOM_LINE_REGEX = regex.compile(
+    # Level must start with nonnegative int, no leading zeros.
+    '^(0|[1-9]+[0-9]*) ' +
+    # Pointer optional, if it exists it must be flanked by '@'
+    '(@[^@]+@ |)' +
+    # Tag must be alphanumeric string
+    '([A-Za-z0-9_]+)' +
+    # Value optional, consists of anything after a space to end of line
+    '( [^\n\r]*|)' +
+    # End of line defined by \n or \r
+    '([\r\n]{1,2})'
+)
+
+# Splits parsed data into lines, keeping terminators. Only \r and \n
+# count as line breaks, matching the line regex above; str.splitlines()
+# would also split on \x0b, \x0c, \x85, U+2028 and U+2029. A final line
+# without a terminator is still yielded so it can be rejected as usual.
+_LINE_SPLIT_REGEX = regex.compile('[^\r\n]*(?:\r\n|[\r\n])|[^\r\n]+')
+
+# Splits a multi-line value on the same terminators, for
+# set_multi_line_value(); other characters stay inside the value.
+_VALUE_SPLIT_REGEX = regex.compile('\r\n|\r|\n')
+
+# Characters the regex above allows in a tag.
+_TAG_CHARS = frozenset(
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_')
+
+_DIGITS = '0123456789'
+
+
+def _tokenize_line(line):
+    """Split a GEDCOM line into (level, pointer, tag, value, crlf)
+
+    Hand-rolled equivalent of _GEDCOM_LINE_REGEX for well-formed lines,
+    avoiding the regex engine and match-object allocation on the parse
+    hot path. Returns None whenever the line does not split cleanly;
+    the caller then falls back to the regex before rejecting the line.
+    """
+    body = line.rstrip('\r\n')
+    crlf = line[len(body):]
+    if not 1 <= len(crlf) <= 2:
+        return None
+    space = body.find(' ')
+    if space < 1:
+        return None
+    level_str = body[:space]
+    # Level must be all digits with no leading zeros.
+    if level_str.strip(_DIGITS) or (level_str[0] == '0' and level_str != '0'):
+        return None
+    rest = body[space + 1:]
+    if rest.startswith('@'):
+        end = rest.find('@', 1)
+        if end < 2 or rest[end + 1:end + 2] != ' ':
+            return None
+        pointer = rest[:end + 1]
+        rest = rest[end + 2:]
+    else:
+        pointer = ''
+    space = rest.find(' ')
+    if space < 0:
+        tag, value = rest, ''
+    else:
+        tag, value = rest[:space], rest[space + 1:]
+    if not tag or not _TAG_CHARS.issuperset(tag):
+        return None
+    return int(level_str), pointer, tag, value, crlf
+
+# Continuation tags filtered out when a multi-line value is replaced.
+_CONTINUATION_TAGS = frozenset(('CONC', 'CONT'))
+
+# Which child tags get_family_members() returns for each mem_type.
+_FAMILY_MEMBER_TAGS = {
+    "ALL": frozenset(("HUSB", "WIFE", "CHIL")),
+    "PARENTS": frozenset(("HUSB", "WIFE")),
+    "HUSB": frozenset(("HUSB",)),
+    "WIFE": frozenset(("WIFE",)),
+    "CHIL": frozenset(("CHIL",)),
+}
+
+# Error message templates for __parse_line, formatted only on failure.
+_ERROR_BAD_LINE = (
+    "Line %d of document violates GEDCOM format"
+    "\nSee: http://homepages.rootsweb.ancestry.com/"
+    "~pmcbride/gedcom/55gctoc.htm")
+_ERROR_BAD_LEVEL = (
+    "Line %d of document violates GEDCOM format"
+    "\nLines must be no more than one level higher than "
+    "previous line.\nSee: http://homepages.rootsweb."
+    "ancestry.com/~pmcbride/gedcom/55gctoc.htm")
+
+# Memo of compiled criteria strings, see _compile_criteria().
+_criteria_cache = {}
+
+
+def _parse_year(date_value):
+    """Return the year of a DATE value as int, or -1 if there is none
+
+    GEDCOM dates put the year last ('12 JAN 1852'), so only the trailing
+    whitespace-separated token gets split off and converted.
+    """
+    parts = date_value.rsplit(None, 1)
+    if not parts:
+        return -1
+    year = parts[-1]
+    # isdecimal() (unlike isdigit()) admits only characters int() accepts,
+    # and the minus may appear once at the front.
+    if year.isdecimal() or (year[0] == '-' and year[1:].isdecimal()):
+        return int(year)
+    return -1
+
+
+def _compile_criteria(criteria):
+    """Compile a criteria string into a list of (method, args) checks
+
+    Each check is an unbound Element predicate with its arguments parsed
+    up front (years as int), so matching an element is just calls — no
+    string parsing. Returns None if the criteria string is malformed or
+    contains an unparseable year, in which case nothing can match.
+    Compiled results get memoized, since the same criteria string is
+    typically matched against many elements.
+    """
+    if criteria in _criteria_cache:
+        return _criteria_cache[criteria]
+    compiled = []
+    for criterion in criteria.split(':'):
+        try:
+            key, value = criterion.split('=')
+        except ValueError:
+            compiled = None
+            break
+        if key == "surname":
+            compiled.append((Element.surname_match, (value,)))
+        elif key == "name":
+            compiled.append((Element.given_match, (value,)))
+        elif key in ("birth", "death"):
+            try:
+                year = int(value)
+            except ValueError:
+                compiled = None
+                break
+            if key == "birth":
+                compiled.append((Element.birth_year_match, (year,)))
+            else:
+                compiled.append((Element.death_year_match, (year,)))
+        elif key in ("birthrange", "deathrange"):
+            try:
+                from_year, to_year = value.split('-')
+                years = (int(from_year), int(to_year))
+            except ValueError:
+                compiled = None
+                break
+            if key == "birthrange":
+                compiled.append((Element.birth_range_match, years))
+            else:
+                compiled.append((Element.death_range_match, years))
+        # Unknown keys never made a criteria string fail; skip them.
+    _criteria_cache[criteria] = compiled
+    return compiled
 
 
 class Gedcom:
@@ -49,6 +209,9 @@ class Gedcom:
         """Initialize a GEDCOM data object. You must supply a GEDCOM file"""
         self.__element_list = []
         self.__element_dict = {}
+        self.__individuals = []
+        self.__marriage_years = {}
+        self.__parents = {}
         self.invalidate_cache()
         self.__element_top = Element(-1, "", "TOP", "")
         self.__parse(file_path)
@@ -60,6 +223,9 @@ class Gedcom:
         """
         self.__element_list = []
         self.__element_dict = {}
+        self.__individuals = []
+        self.__marriage_years = {}
+        self.__parents = {}
 
     def element_list(self):
         """Return a list of all the elements in the GEDCOM file
@@ -92,6 +258,18 @@ class Gedcom:
             self.__element_dict = {element.pointer(): element for element in self.records() if element.pointer()}
         return self.__element_dict
 
+    def individuals(self):
+        """Return a list of all the individuals in the GEDCOM file
+
+        Individuals are in the same order as they appeared in the file.
+        This list gets generated on-the-fly, but gets cached like
+        element_list(); call invalidate_cache() after modifying the
+        database.
+        """
+        if not self.__individuals:
+            self.__individuals = [record for record in self.records() if record.is_individual()]
+        return self.__individuals
+
     def root(self):
         """Returns a virtual root element containing all logical records as children
 
@@ -110,69 +288,73 @@ class Gedcom:
 
     def __parse(self, file_path):
         """Open and parse file path as GEDCOM 5.5 formatted data"""
-        gedcom_file = open(file_path, 'rb')
+        with open(file_path, 'rb') as gedcom_file:
+            data = gedcom_file.read().decode('utf-8')
         line_number = 1
-        last_element = self.__element_top
-        for line in gedcom_file:
-            last_element = self.__parse_line(line_number, line.decode('utf-8'), last_element)
+        # Stack of elements on the path from the root to the last parsed
+        # element: element_stack[i] holds the open element of level i - 1.
+        element_stack = [self.__element_top]
+        parse_line = self.__parse_line
+        for match in _LINE_SPLIT_REGEX.finditer(data):
+            parse_line(line_number, match.group(), element_stack)
             line_number += 1
 
-    def __parse_line(self, line_num, line, last_elem):
+    def __parse_line(self, line_num, line, element_stack):
         """Parse a line from a GEDCOM 5.5 formatted document
 
         Each line should have the following (bracketed items optional):
         level + ' ' + [pointer + ' ' +] tag + [' ' + line_value]
         """
-        ged_line_regex = (
-            # Level must start with nonnegative int, no leading zeros.
-                '^(0|[1-9]+[0-9]*) ' +
-                # Pointer optional, if it exists it must be flanked by '@'
-                '(@[^@]+@ |)' +
-                # Tag must be alphanumeric string
-                '([A-Za-z0-9_]+)' +
-                # Value optional, consists of anything after a space to end of line
-                '( [^\n\r]*|)' +
-                # End of line defined by \n or \r
-                '([\r\n]{1,2})'
-        )
-        if regex.match(ged_line_regex, line):
-            line_parts = regex.match(ged_line_regex, line).groups()
-        else:
-            error_message = ("Line %d of document violates GEDCOM format" % line_num +
-                             "\nSee: http://homepages.rootsweb.ancestry.com/" +
-                             "~pmcbride/gedcom/55gctoc.htm")
-            raise SyntaxError(error_message)
-
-        level = int(line_parts[0])
-        pointer = line_parts[1].rstrip(' ')
-        tag = line_parts[2]
-        value = line_parts[3][1:]
-        crlf = line_parts[4]
-
-        # Check level: should never be more than one higher than previous line.
-        if level > last_elem.level() + 1:
-            error_message = ("Line %d of document violates GEDCOM format" % line_num +
-                             "\nLines must be no more than one level higher than " +
-                             "previous line.\nSee: http://homepages.rootsweb." +
-                             "ancestry.com/~pmcbride/gedcom/55gctoc.htm")
-            raise SyntaxError(error_message)
+        parts = _tokenize_line(line)
+        if parts is None:
+            # Let the regex double-check anything the fast tokenizer
+            # refused, so unusual-but-valid lines still parse.
+            match = _GEDCOM_LINE_REGEX.match(line)
+            if match is None:
+                raise SyntaxError(_ERROR_BAD_LINE % line_num)
+            line_parts = match.groups()
+            parts = (int(line_parts[0]), line_parts[1].rstrip(' '),
+                     line_parts[2], line_parts[3][1:], line_parts[4])
+        level, pointer, tag, value, crlf = parts
+        # GEDCOM files repeat a small set of tags millions of times;
+        # interning collapses the duplicates and makes tag comparisons
+        # start with a pointer check.
+        tag = intern(tag)
+
+        # Check level: should never be more than one higher than previous
+        # line. element_stack[i] holds the open element of level i - 1,
+        # so the previous line's level is len(element_stack) - 2.
+        if level >= len(element_stack):
+            raise SyntaxError(_ERROR_BAD_LEVEL % line_num)
 
         # Create element. Store in list and dict, create children and parents.
         element = Element(level, pointer, tag, value, crlf, multi_line=False)
 
-        # Start with last element as parent, back up if necessary.
-        parent_elem = last_elem
-        while parent_elem.level() > level - 1:
-            parent_elem = parent_elem.parent()
-        # Add child to parent & parent to child.
-        parent_elem.add_child(element)
+        # The parent is the open element one level up; drop any deeper ones.
+        del element_stack[level + 1:]
+        element_stack[-1].add_child(element)
+        element_stack.append(element)
+
+        # The parser visits every element in document order, so fill the
+        # flat-list and pointer-dict caches here instead of re-walking
+        # the tree afterwards. invalidate_cache() falls back to the
+        # rebuild path in element_list()/element_dict().
+        self.__element_list.append(element)
+        if pointer != '' and level == 0:
+            self.__element_dict[pointer] = element
         return element
 
     def __build_list(self, element, element_list):
-        """Recursively add Elements to a list containing elements"""
-        element_list.append(element)
-        for child in element.children():
-            self.__build_list(child, element_list)
+        """Add an element and all its descendants to a list, in document order"""
+        append = element_list.append
+        stack = [element]
+        pop = stack.pop
+        extend = stack.extend
+        while stack:
+            current = pop()
+            append(current)
+            # Reversed so the next element popped is the first child.
+            extend(reversed(current.children()))
 
     # Methods for analyzing individuals and relationships between individuals
 
@@ -184,35 +366,41 @@ class Gedcom:
         # Get and analyze families where individual is spouse.
         families = self.families(individual, "FAMS")
         for family in families:
-            for family_data in family.children():
-                if family_data.tag() == "MARR":
-                    for marriage_data in family_data.children():
-                        date = ''
-                        place = ''
-                        if marriage_data.tag() == "DATE":
-                            date = marriage_data.value()
-                        if marriage_data.tag() == "PLAC":
-                            place = marriage_data.value()
-                        marriages.append((date, place))
+            for family_data in family.children_with_tag("MARR"):
+                for marriage_data in family_data.children():
+                    tag = marriage_data.tag()
+                    date = ''
+                    place = ''
+                    if tag == "DATE":
+                        date = marriage_data.value()
+                    elif tag == "PLAC":
+                        place = marriage_data.value()
+                    marriages.append((date, place))
         return marriages
 
     def marriage_years(self, individual):
-        """Return list of marriage years (as int) for an individual"""
-        dates = []
+        """Return list of marriage years (as int) for an individual
+
+        The parsed years get cached per individual; invalidate_cache()
+        clears them along with the element list and dict.
+        """
         if not individual.is_individual():
             raise ValueError("Operation only valid for elements with INDI tag")
+        pointer = individual.pointer()
+        if pointer and pointer in self.__marriage_years:
+            # Copied so callers can't corrupt the cache.
+            return list(self.__marriage_years[pointer])
+        dates = []
         # Get and analyze families where individual is spouse.
         families = self.families(individual, "FAMS")
         for family in families:
-            for family_data in family.children():
-                if family_data.tag() == "MARR":
-                    for marriage_data in family_data.children():
-                        if marriage_data.tag() == "DATE":
-                            date = marriage_data.value().split()[-1]
-                            try:
-                                dates.append(int(date))
-                            except ValueError:
-                                pass
+            for family_data in family.children_with_tag("MARR"):
+                for marriage_data in family_data.children_with_tag("DATE"):
+                    year = _parse_year(marriage_data.value())
+                    if year != -1:
+                        dates.append(year)
+        if pointer:
+            self.__marriage_years[pointer] = list(dates)
         return dates
 
     def marriage_year_match(self, individual, year):
@@ -223,10 +411,7 @@ class Gedcom:
     def marriage_range_match(self, individual, year1, year2):
         """Check if one of the marriage year of an individual is in a given range. Years are integers."""
         years = self.marriage_years(individual)
-        for year in years:
-            if year1 <= year <= year2:
-                return True
-        return False
+        return any(year1 <= year <= year2 for year in years)
 
     def families(self, individual, family_type="FAMS"):
         """Return family elements listed for an individual
@@ -239,12 +424,10 @@ class Gedcom:
             raise ValueError("Operation only valid for elements with INDI tag.")
         families = []
         element_dict = self.element_dict()
-        for child in individual.children():
-            is_family = (child.tag() == family_type and
-                         child.value() in element_dict and
-                         element_dict[child.value()].is_family())
-            if is_family:
-                families.append(element_dict[child.value()])
+        for child in individual.children_with_tag(family_type):
+            family = element_dict.get(child.value())
+            if family is not None and family.is_family():
+                families.append(family)
         return families
 
     def get_ancestors(self, individual, anc_type="ALL"):
@@ -255,10 +438,22 @@ class Gedcom:
         """
         if not individual.is_individual():
             raise ValueError("Operation only valid for elements with INDI tag.")
-        parents = self.get_parents(individual, anc_type)
-        ancestors = parents
-        for parent in parents:
-            ancestors = ancestors + self.get_ancestors(parent)
+        ancestors = []
+        seen = set()
+        # The first generation honors anc_type; deeper generations use
+        # "ALL", as the recursive version did.
+        stack = self.get_parents(individual, anc_type)
+        stack.reverse()
+        while stack:
+            parent = stack.pop()
+            pointer = parent.pointer()
+            if pointer in seen:
+                continue
+            seen.add(pointer)
+            ancestors.append(parent)
+            grandparents = self.get_parents(parent)
+            grandparents.reverse()
+            stack.extend(grandparents)
         return ancestors
 
     def get_parents(self, individual, parent_type="ALL"):
@@ -266,41 +461,68 @@ class Gedcom:
         
         Optional parent_type. Default "ALL" returns all parents. "NAT" can be
         used to specify only natural (genetic) parents. 
+
+        Results get cached per individual, since ancestry walks ask for
+        the same parents repeatedly; invalidate_cache() clears them.
         """
         if not individual.is_individual():
             raise ValueError("Operation only valid for elements with INDI tag.")
+        cache_key = (individual.pointer(), parent_type)
+        if cache_key[0] and cache_key in self.__parents:
+            return list(self.__parents[cache_key])
         parents = []
         families = self.families(individual, "FAMC")
         for family in families:
             if parent_type == "NAT":
-                for family_member in family.children():
-                    if family_member.tag() == "CHIL" and family_member.value() == individual.pointer():
+                pointer = individual.pointer()
+                for family_member in family.children_with_tag("CHIL"):
+                    if family_member.value() == pointer:
                         for child in family_member.children():
                             if child.value() == "Natural":
-                                if child.tag() == "_MREL":
-                                    parents = (parents +
-                                               self.get_family_members(family, "WIFE"))
-                                elif child.tag() == "_FREL":
-                                    parents = (parents +
-                                               self.get_family_members(family, "HUSB"))
+                                tag = child.tag()
+                                if tag == "_MREL":
+                                    parents.extend(self.get_family_members(family, "WIFE"))
+                                elif tag == "_FREL":
+                                    parents.extend(self.get_family_members(family, "HUSB"))
             else:
-                parents = parents + self.get_family_members(family, "PARENTS")
+                parents.extend(self.get_family_members(family, "PARENTS"))
+        if cache_key[0]:
+            self.__parents[cache_key] = list(parents)
         return parents
 
     def find_path_to_anc(self, desc, anc, path=None):
-        """Return path from descendant to ancestor"""
+        """Return path from descendant to ancestor
+
+        The search runs breadth-first, so the returned path is a
+        shortest one. Returns None if anc is not an ancestor of desc.
+        """
         if not desc.is_individual() and anc.is_individual():
             raise ValueError("Operation only valid for elements with IND tag.")
-        if not path:
-            path = [desc]
-        if path[-1].pointer() == anc.pointer():
-            return path
+        if path:
+            prefix, start = list(path[:-1]), path[-1]
         else:
-            parents = self.get_parents(desc, "NAT")
-            for par in parents:
-                potential_path = self.find_path_to_anc(par, anc, path + [par])
-                if potential_path:
-                    return potential_path
+            prefix, start = [], desc
+        target = anc.pointer()
+        # Maps each visited pointer to the element it was reached from,
+        # for path reconstruction once the target is found.
+        came_from = {start.pointer(): None}
+        frontier = [start]
+        while frontier:
+            next_frontier = []
+            for person in frontier:
+                if person.pointer() == target:
+                    chain = []
+                    while person is not None:
+                        chain.append(person)
+                        person = came_from[person.pointer()]
+                    chain.reverse()
+                    return prefix + chain
+                for parent in self.get_parents(person, "NAT"):
+                    pointer = parent.pointer()
+                    if pointer not in came_from:
+                        came_from[pointer] = person
+                        next_frontier.append(parent)
+            frontier = next_frontier
         return None
 
     def get_family_members(self, family, mem_type="ALL"):
@@ -317,22 +539,13 @@ class Gedcom:
             raise ValueError("Operation only valid for elements with FAM tag.")
         family_members = []
         element_dict = self.element_dict()
+        # Default is ALL
+        member_tags = _FAMILY_MEMBER_TAGS.get(mem_type, _FAMILY_MEMBER_TAGS["ALL"])
         for elem in family.children():
-            # Default is ALL
-            is_family = (elem.tag() == "HUSB" or
-                         elem.tag() == "WIFE" or
-                         elem.tag() == "CHIL")
-            if mem_type == "PARENTS":
-                is_family = (elem.tag() == "HUSB" or
-                             elem.tag() == "WIFE")
-            elif mem_type == "HUSB":
-                is_family = (elem.tag() == "HUSB")
-            elif mem_type == "WIFE":
-                is_family = (elem.tag() == "WIFE")
-            elif mem_type == "CHIL":
-                is_family = (elem.tag() == "CHIL")
-            if is_family and elem.value() in element_dict:
-                family_members.append(element_dict[elem.value()])
+            if elem.tag() in member_tags:
+                family_member = element_dict.get(elem.value())
+                if family_member is not None:
+                    family_members.append(family_member)
         return family_members
 
     # Other methods
@@ -344,10 +557,7 @@ class Gedcom:
 
     def save_gedcom(self, open_file):
         """Save GEDCOM data to a file"""
-        if version_info[0] >= 3:
-            open_file.write(self.root().get_individual())
-        else:
-            open_file.write(self.root().get_individual().encode('utf-8'))
+        open_file.write(self.root().get_individual())
 
 
 class GedcomParseError(Exception):
@@ -386,6 +596,10 @@ class Element:
     See a GEDCOM file for examples of tags and their values.
     """
 
+    __slots__ = ('__level', '__pointer', '__tag', '__value', '__crlf',
+                 '__children', '__children_by_tag', '__parent', '__line',
+                 '__name', '__birth_year', '__death_year')
+
     def __init__(self, level, pointer, tag, value, crlf="\n", multi_line=True):
         """Initialize an element
         
@@ -400,7 +614,13 @@ class Element:
         self.__crlf = crlf
         # structuring
         self.__children = []
+        self.__children_by_tag = None
         self.__parent = None
+        # caches for parsed and formatted data
+        self.__line = None
+        self.__name = None
+        self.__birth_year = None
+        self.__death_year = None
         if multi_line:
             self.set_multi_line_value(value)
 
@@ -423,23 +643,24 @@ class Element:
     def set_value(self, value):
         """Set the value of this element"""
         self.__value = value
+        self.__line = None
 
     def multi_line_value(self):
         """Return the value of this element including continuations"""
-        result = self.value()
+        result = self.__value
         last_crlf = self.__crlf
-        for e in self.children():
-            tag = e.tag()
+        for e in self.__children:
+            tag = e.__tag
             if tag == 'CONC':
-                result += e.value()
+                result += e.__value
                 last_crlf = e.__crlf
             elif tag == 'CONT':
-                result += last_crlf + e.value()
+                result += last_crlf + e.__value
                 last_crlf = e.__crlf
         return result
 
     def __avail_chars(self):
-        n = len(self.__unicode__())
+        n = len(self.__str__())
         if n > 255:
             return 0
         return 255 - n
@@ -475,9 +696,24 @@ class Element:
     def set_multi_line_value(self, value):
         """Set the value of this element, adding continuation lines as necessary"""
         self.set_value('')
-        self.children()[:] = [child for child in self.children() if child.tag() not in ('CONC', 'CONT')]
-
-        lines = value.splitlines()
+        for child in self.__children:
+            if child.__tag in _CONTINUATION_TAGS:
+                self.__children[:] = [child for child in self.__children
+                                      if child.__tag not in _CONTINUATION_TAGS]
+                self.__children_by_tag = None
+                break
+
+        # Most values are a single line that fits within the GEDCOM line
+        # limit; set those directly without the split/bound machinery.
+        if '\n' not in value and '\r' not in value:
+            if len(value) <= self.__avail_chars():
+                self.set_value(value)
+                return
+
+        lines = _VALUE_SPLIT_REGEX.split(value)
+        # Like splitlines(), a trailing terminator does not open a line.
+        if lines[-1] == '':
+            lines.pop()
         if lines:
             line = lines.pop(0)
             n = self.__set_bounded_value(line)
@@ -491,20 +727,35 @@ class Element:
         """Return the child elements of this element"""
         return self.__children
 
+    def children_with_tag(self, tag):
+        """Return the child elements of this element that have the given tag
+
+        Children keep the same order as in children(). The index backing
+        this lookup is built lazily and rebuilt after children change.
+        """
+        if self.__children_by_tag is None:
+            index = {}
+            for child in self.__children:
+                index.setdefault(child.__tag, []).append(child)
+            self.__children_by_tag = index
+        return self.__children_by_tag.get(tag, [])
+
     def parent(self):
         """Return the parent element of this element"""
         return self.__parent
 
     def new_child(self, tag, pointer='', value=''):
         """Create and return a new child element of this element"""
-        child = Element(self.level() + 1, pointer, tag, value, self.__crlf)
+        child = Element(self.__level + 1, pointer, tag, value, self.__crlf)
         self.add_child(child)
         return child
 
     def add_child(self, element):
         """Add a child element to this element"""
-        self.children().append(element)
-        element.add_parent(self)
+        self.__children.append(element)
+        if self.__children_by_tag is not None:
+            self.__children_by_tag.setdefault(element.__tag, []).append(element)
+        element.__parent = self
 
     def add_parent(self, element):
         """Add a parent element to this element
@@ -516,19 +767,19 @@ class Element:
 
     def is_individual(self):
         """Check if this element is an individual"""
-        return self.tag() == "INDI"
+        return self.__tag == "INDI"
 
     def is_family(self):
         """Check if this element is a family"""
-        return self.tag() == "FAM"
+        return self.__tag == "FAM"
 
     def is_file(self):
         """Check if this element is a file"""
-        return self.tag() == "FILE"
+        return self.__tag == "FILE"
 
     def is_object(self):
         """Check if this element is an object"""
-        return self.tag() == "OBJE"
+        return self.__tag == "OBJE"
 
     # criteria matching
 
@@ -550,64 +801,21 @@ class Element:
         death=[year]
         deathrange=[year1-year2]
         """
-
-        # error checking on the criteria
-        try:
-            for criterion in criteria.split(':'):
-                key, value = criterion.split('=')
-        except:
+        checks = _compile_criteria(criteria)
+        if checks is None:
             return False
-        match = True
-        for criterion in criteria.split(':'):
-            key, value = criterion.split('=')
-            if key == "surname" and not self.surname_match(value):
-                match = False
-            elif key == "name" and not self.given_match(value):
-                match = False
-            elif key == "birth":
-                try:
-                    year = int(value)
-                    if not self.birth_year_match(year):
-                        match = False
-                except:
-                    match = False
-            elif key == "birthrange":
-                try:
-                    from_year, to_year = value.split('-')
-                    from_year = int(from_year)
-                    to_year = int(to_year)
-                    if not self.birth_range_match(from_year, to_year):
-                        match = False
-                except:
-                    match = False
-            elif key == "death":
-                try:
-                    year = int(value)
-                    if not self.death_year_match(year):
-                        match = False
-                except:
-                    match = False
-            elif key == "deathrange":
-                try:
-                    from_year, to_year = value.split('-')
-                    from_year = int(from_year)
-                    to_year = int(to_year)
-                    if not self.death_range_match(from_year, to_year):
-                        match = False
-                except:
-                    match = False
-
-        return match
+        for method, args in checks:
+            if not method(self, *args):
+                return False
+        return True
 
     def surname_match(self, name):
         """Match a string with the surname of an individual"""
-        (first, last) = self.name()
-        return last.find(name) >= 0
+        return name in self.name()[1]
 
     def given_match(self, name):
         """Match a string with the given names of an individual"""
-        (first, last) = self.name()
-        return first.find(name) >= 0
+        return name in self.name()[0]
 
     def birth_year_match(self, year):
         """Match the birth year of an individual. Year is an integer"""
@@ -616,6 +824,9 @@ class Element:
     def birth_range_match(self, year1, year2):
         """Check if the birth year of an individual is in a given range. Years are integers"""
         year = self.birth_year()
+        # Non-individuals report "" as their year; they never match.
+        if year == "":
+            return False
         if year1 <= year <= year2:
             return True
         return False
@@ -627,42 +838,49 @@ class Element:
     def death_range_match(self, year1, year2):
         """Check if the death year of an individual is in a given range. Years are integers"""
         year = self.death_year()
+        # Non-individuals report "" as their year; they never match.
+        if year == "":
+            return False
         if year1 <= year <= year2:
             return True
         return False
 
     def name(self):
-        """Return a person's names as a tuple: (first,last)"""
+        """Return a person's names as a tuple: (first,last)
+
+        The parsed tuple gets cached on first use.
+        """
+        if self.__name is not None:
+            return self.__name
         first = ""
         last = ""
         if not self.is_individual():
             return first, last
-        for child in self.children():
-            if child.tag() == "NAME":
-                # some older GEDCOM files don't use child tags but instead
-                # place the name in the value of the NAME tag
-                if child.value() != "":
-                    name = child.value().split('/')
-                    if len(name) > 0:
-                        first = name[0].strip()
-                        if len(name) > 1:
-                            last = name[1].strip()
-                else:
-                    for childOfChild in child.children():
-                        if childOfChild.tag() == "GIVN":
-                            first = childOfChild.value()
-                        if childOfChild.tag() == "SURN":
-                            last = childOfChild.value()
-        return first, last
+        for child in self.children_with_tag("NAME"):
+            # some older GEDCOM files don't use child tags but instead
+            # place the name in the value of the NAME tag
+            if child.__value != "":
+                name = child.__value.split('/')
+                if len(name) > 0:
+                    first = name[0].strip()
+                    if len(name) > 1:
+                        last = name[1].strip()
+            else:
+                for childOfChild in child.__children:
+                    if childOfChild.__tag == "GIVN":
+                        first = childOfChild.__value
+                    if childOfChild.__tag == "SURN":
+                        last = childOfChild.__value
+        self.__name = (first, last)
+        return self.__name
 
     def gender(self):
         """Return the gender of a person in string format"""
         gender = ""
         if not self.is_individual():
             return gender
-        for child in self.children():
-            if child.tag() == "SEX":
-                gender = child.value()
+        for child in self.children_with_tag("SEX"):
+            gender = child.__value
         return gender
 
     def private(self):
@@ -670,11 +888,10 @@ class Element:
         private = False
         if not self.is_individual():
             return private
-        for child in self.children():
-            if child.tag() == "PRIV":
-                private = child.value()
-                if private == 'Y':
-                    private = True
+        for child in self.children_with_tag("PRIV"):
+            private = child.__value
+            if private == 'Y':
+                private = True
         return private
 
     def birth(self):
@@ -684,34 +901,30 @@ class Element:
         source = ()
         if not self.is_individual():
             return date, place, source
-        for child in self.children():
-            if child.tag() == "BIRT":
-                for childOfChild in child.children():
-                    if childOfChild.tag() == "DATE":
-                        date = childOfChild.value()
-                    if childOfChild.tag() == "PLAC":
-                        place = childOfChild.value()
-                    if childOfChild.tag() == "SOUR":
-                        source = source + (childOfChild.value(),)
-        return date, place, source
+        sources = []
+        for child in self.children_with_tag("BIRT"):
+            for childOfChild in child.__children:
+                tag = childOfChild.__tag
+                if tag == "DATE":
+                    date = childOfChild.__value
+                elif tag == "PLAC":
+                    place = childOfChild.__value
+                elif tag == "SOUR":
+                    sources.append(childOfChild.__value)
+        return date, place, tuple(sources)
 
     def birth_year(self):
-        """Return the birth year of a person in integer format"""
-        date = ""
+        """Return the birth year of a person in integer format
+
+        The parsed year gets cached on first use.
+        """
+        if self.__birth_year is not None:
+            return self.__birth_year
         if not self.is_individual():
-            return date
-        for child in self.children():
-            if child.tag() == "BIRT":
-                for childOfChild in child.children():
-                    if childOfChild.tag() == "DATE":
-                        date_split = childOfChild.value().split()
-                        date = date_split[len(date_split) - 1]
-        if date == "":
-            return -1
-        try:
-            return int(date)
-        except:
-            return -1
+            return ""
+        year = _parse_year(self.birth()[0])
+        self.__birth_year = year
+        return year
 
     def death(self):
         """Return the death tuple of a person as (date,place)"""
@@ -720,34 +933,30 @@ class Element:
         source = ()
         if not self.is_individual():
             return date, place
-        for child in self.children():
-            if child.tag() == "DEAT":
-                for childOfChild in child.children():
-                    if childOfChild.tag() == "DATE":
-                        date = childOfChild.value()
-                    if childOfChild.tag() == "PLAC":
-                        place = childOfChild.value()
-                    if childOfChild.tag() == "SOUR":
-                        source = source + (childOfChild.value(),)
-        return date, place, source
+        sources = []
+        for child in self.children_with_tag("DEAT"):
+            for childOfChild in child.__children:
+                tag = childOfChild.__tag
+                if tag == "DATE":
+                    date = childOfChild.__value
+                elif tag == "PLAC":
+                    place = childOfChild.__value
+                elif tag == "SOUR":
+                    sources.append(childOfChild.__value)
+        return date, place, tuple(sources)
 
     def death_year(self):
-        """Return the death year of a person in integer format"""
-        date = ""
+        """Return the death year of a person in integer format
+
+        The parsed year gets cached on first use.
+        """
+        if self.__death_year is not None:
+            return self.__death_year
         if not self.is_individual():
-            return date
-        for child in self.children():
-            if child.tag() == "DEAT":
-                for childOfChild in child.children():
-                    if childOfChild.tag() == "DATE":
-                        date_split = childOfChild.value().split()
-                        date = date_split[len(date_split) - 1]
-        if date == "":
-            return -1
-        try:
-            return int(date)
-        except:
-            return -1
+            return ""
+        year = _parse_year(self.death()[0])
+        self.__death_year = year
+        return year
 
     def burial(self):
         """Return the burial tuple of a person as (date,place)"""
@@ -756,35 +965,36 @@ class Element:
         source = ()
         if not self.is_individual():
             return date, place
-        for child in self.children():
-            if child.tag() == "BURI":
-                for childOfChild in child.children():
-                    if childOfChild.tag() == "DATE":
-                        date = childOfChild.value()
-                    if childOfChild.tag() == "PLAC":
-                        place = childOfChild.value()
-                    if childOfChild.tag() == "SOUR":
-                        source = source + (childOfChild.value(),)
-        return date, place, source
+        sources = []
+        for child in self.children_with_tag("BURI"):
+            for childOfChild in child.__children:
+                tag = childOfChild.__tag
+                if tag == "DATE":
+                    date = childOfChild.__value
+                elif tag == "PLAC":
+                    place = childOfChild.__value
+                elif tag == "SOUR":
+                    sources.append(childOfChild.__value)
+        return date, place, tuple(sources)
 
     def census(self):
         """Return list of census tuples (date, place) for an individual"""
         census = []
         if not self.is_individual():
             raise ValueError("Operation only valid for elements with INDI tag")
-        for child in self.children():
-            if child.tag() == "CENS":
-                date = ''
-                place = ''
-                source = ''
-                for childOfChild in child.children():
-                    if childOfChild.tag() == "DATE":
-                        date = childOfChild.value()
-                    if childOfChild.tag() == "PLAC":
-                        place = childOfChild.value()
-                    if childOfChild.tag() == "SOUR":
-                        source = source + (childOfChild.value(),)
-                census.append((date, place, source))
+        for child in self.children_with_tag("CENS"):
+            date = ''
+            place = ''
+            sources = []
+            for childOfChild in child.__children:
+                tag = childOfChild.__tag
+                if tag == "DATE":
+                    date = childOfChild.__value
+                elif tag == "PLAC":
+                    place = childOfChild.__value
+                elif tag == "SOUR":
+                    sources.append(childOfChild.__value)
+            census.append((date, place, tuple(sources)))
         return census
 
     def last_updated(self):
@@ -792,11 +1002,10 @@ class Element:
         date = ""
         if not self.is_individual():
             return date
-        for child in self.children():
-            if child.tag() == "CHAN":
-                for childOfChild in child.children():
-                    if childOfChild.tag() == "DATE":
-                        date = childOfChild.value()
+        for child in self.children_with_tag("CHAN"):
+            dates = child.children_with_tag("DATE")
+            if dates:
+                date = dates[-1].__value
         return date
 
     def occupation(self):
@@ -804,42 +1013,50 @@ class Element:
         occupation = ""
         if not self.is_individual():
             return occupation
-        for child in self.children():
-            if child.tag() == "OCCU":
-                occupation = child.value()
+        occupations = self.children_with_tag("OCCU")
+        if occupations:
+            occupation = occupations[-1].__value
         return occupation
 
     def deceased(self):
         """Check if a person is deceased"""
         if not self.is_individual():
             return False
-        for child in self.children():
-            if child.tag() == "DEAT":
-                return True
+        if self.children_with_tag("DEAT"):
+            return True
         return False
 
     def get_individual(self):
         """Return this element and all of its sub-elements"""
-        result = self.__unicode__()
-        for child in self.children():
-            result += child.get_individual()
-        return result
+        lines = []
+        append_line = lines.append
+        stack = [self]
+        pop = stack.pop
+        extend = stack.extend
+        while stack:
+            element = pop()
+            append_line(element.__str__())
+            # Reversed so the next element popped is the first child.
+            extend(reversed(element.__children))
+        return ''.join(lines)
 
     def __str__(self):
-        if version_info[0] >= 3:
-            return self.__unicode__()
-        else:
-            return self.__unicode__().encode('utf-8')
+        """Format this element as its original string
 
-    def __unicode__(self):
-        """Format this element as its original string"""
-        if self.level() < 0:
+        The formatted line gets cached; set_value() invalidates it. The
+        other fields never change after construction.
+        """
+        if self.__line is not None:
+            return self.__line
+        if self.__level < 0:
+            self.__line = ''
             return ''
-        result = str(self.level())
-        if self.pointer() != "":
-            result += ' ' + self.pointer()
-        result += ' ' + self.tag()
-        if self.value() != "":
-            result += ' ' + self.value()
-        result += self.__crlf
-        return result
+        parts = [str(self.__level)]
+        if self.__pointer != "":
+            parts.append(self.__pointer)
+        parts.append(self.__tag)
+        if self.__value != "":
+            parts.append(self.__value)
+        line = ' '.join(parts) + self.__crlf
+        self.__line = line
+        return line
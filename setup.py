@@ -1,4 +1,7 @@
-from distutils.core import setup
+from setuptools import setup
+
+with open('README.md') as readme_file:
+    readme = readme_file.read()
 
 setup(
     name='python-gedcom',
@@ -6,9 +9,10 @@ setup(
     packages=['gedcom', ],
     license='GPLv2',
     package_dir={'': '.'},
-    description=open('README.md').readlines()[0].strip(),
-    long_description=open('README.md').read(),
+    description=readme.splitlines()[0].strip(),
+    long_description=readme,
     maintainer='Madeleine Ball',
     maintainer_email='mpball@gmail.com',
     url='https://github.com/madprime/python-gedcom',
+    python_requires='>=3.7',
 )